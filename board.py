@@ -10,6 +10,10 @@ MINIMAX_DEPTH = 5
 AI_TURN = 2
 PLAYER_TURN = 1
 
+def mirror_column(col, mirrored=True):
+    """Translate a column between a position and its mirror across the center column."""
+    return COLS - 1 - col if mirrored else col
+
 class Board:
     def __init__(self):
         """Initialize the board with all zeroes (empty cells)."""
@@ -75,6 +79,25 @@ class Board:
         new_board.board = self.board.copy()
         return new_board
     
+    def key(self):
+        """Return a compact hashable key for the position (one byte per cell)."""
+        return self.board.astype(np.uint8).tobytes()
+
+    def mirror_key(self):
+        """Return the key of the position mirrored across the center column."""
+        return self.board[:, ::-1].astype(np.uint8).tobytes()
+
+    def canonical_key(self):
+        """Return (key, mirrored): the lesser of the key and its mirror, and whether the mirror was taken.
+
+        Caches keyed on the canonical key share entries between mirrored positions; moves stored
+        under it are translated back with mirror_column(col, mirrored).
+        """
+        key, mirror = self.key(), self.mirror_key()
+        if mirror < key:
+            return mirror, True
+        return key, False
+
     def is_game_over(self, game_board):
         if game_board.has_won(PLAYER_TURN) or game_board.has_won(AI_TURN):
             return True
@@ -1,43 +1,95 @@
-import pygame
+import argparse
+import importlib
+import subprocess
 import sys
+import threading
 import time
 from board import *
-from minimax import Minimax
-from greedy import GreedyAI
-from iterative_deepening import IterativeDeepeningAI
-from mcts import MonteCarloTreeSearch 
+from engines import ENGINES, engine_factory, load_engine
+from game_record import GameRecord, GameRecordReader, GameRecordWriter
 
-class Connect4:
-    def __init__(self):
-        """Initialize the game, set up Pygame, and create the game board."""
+pygame = None  # Imported by load_pygame() the first time a window is needed
+renderer = None  # Likewise for the renderer module, which imports pygame itself
+
+def load_pygame():
+    """Import and initialise pygame on first use so headless runs never pay for it."""
+    global pygame, renderer
+    if pygame is None:
+        pygame = importlib.import_module("pygame")
         pygame.init()
+        renderer = importlib.import_module("renderer")
+    return pygame
+
+class AIWorker:
+    def __init__(self, ai, board):
+        """Run the engine's get_move on a background thread so the window keeps responding; poll done()."""
+        self.move = None
+        self.error = None
+        self.elapsed = 0.0
+        self.thread = threading.Thread(target=self.run, args=(ai, board.copy()), daemon=True)
+        self.thread.start()
+
+    def run(self, ai, board):
+        start = time.time()
+        try:
+            self.move = ai.get_move(board)
+        except Exception as error:
+            self.error = error
+        self.elapsed = time.time() - start
+
+    def done(self):
+        return not self.thread.is_alive()
+
+    def result(self):
+        if self.error is not None:
+            raise self.error
+        return self.move
+
+class Connect4:
+    def __init__(self, headless=False, recorder=None):
+        """Initialize the game and create the game board. Pygame is loaded when the screen is created."""
+        self.headless = headless
+        self.recorder = recorder  # GameRecordWriter that keeps every AI-vs-AI game, if given
         self.screen = None
-        self.font = pygame.font.Font(None, 40)
+        self.font = None
+        self.renderer = None
+        self.clock = None
         self.board = Board()  # Use Board class
         self.current_player = PLAYER_TURN
         self.game_over = False
         self.history = []
         
     def create_screen(self):
+        if self.headless:
+            return
+        load_pygame()
+        self.font = pygame.font.Font(None, 40)
         self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
         pygame.display.set_caption("Connect 4")
+        self.renderer = renderer.Renderer(self.screen, self.font)
+        self.clock = pygame.time.Clock()
         self.draw_board()
     
     def draw_board(self, highlight_col=None):
-        """Draw the entire game board on the screen."""
+        """Redraw the entire game board on the screen."""
+        if not self.screen:
+            return
+        self.renderer.set_highlight(highlight_col)
+        self.renderer.invalidate()
+        self.renderer.update(self.board)
+
+    def run_frames(self, duration=0.0):
+        """Keep drawing and handling window events until animations finish and `duration` has passed."""
         if not self.screen:
             return
-        self.screen.fill(BLACK)
-        for c in range(COLS):
-            for r in range(ROWS):
-                color = BLUE if c != highlight_col else GRAY
-                x, y = c * SQ_SIZE + SQ_SIZE // 2, r * SQ_SIZE + SQ_SIZE + SQ_SIZE // 2
-                pygame.draw.rect(self.screen, color, (c * SQ_SIZE, r * SQ_SIZE + SQ_SIZE, SQ_SIZE, SQ_SIZE), border_radius=10)
-                pygame.draw.circle(self.screen, BLACK, (x, y), RADIUS)
-                piece = self.board.board[r][c]
-                if piece != 0:
-                    pygame.draw.circle(self.screen, RED if piece == PLAYER_TURN else YELLOW, (x, y), RADIUS)
-        pygame.display.update()
+        end = time.time() + duration
+        while self.renderer.animating or time.time() < end:
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    pygame.quit()
+                    sys.exit()
+            self.renderer.update(self.board)
+            self.clock.tick(renderer.FPS)
     
     def make_move(self, col):
         row = self.board.get_available_row(col)
@@ -45,7 +97,6 @@ class Connect4:
             self.board.place_piece(row, col, self.current_player)
             self.history.append((row, col))
             self.animate_drop(col, row, self.current_player)
-            self.draw_board()
             if self.board.has_won(self.current_player):
                 winner_text = "Player Wins!" if self.current_player == PLAYER_TURN else "AI Wins!"
                 self.show_message(winner_text, RED if self.current_player == PLAYER_TURN else YELLOW)
@@ -57,10 +108,9 @@ class Connect4:
                 self.current_player = 3 - self.current_player
 
     def show_message(self, text, color):
-        label = self.font.render(text, True, color)
-        self.screen.fill(BLACK, (0, 0, WIDTH, SQ_SIZE))
-        self.screen.blit(label, (WIDTH // 2 - label.get_width() // 2, SQ_SIZE // 4))
-        pygame.display.update()
+        if not self.screen:
+            return
+        self.renderer.show_message(text, color)
 
     # play function to play with player vs ai
     def play(self, ai_class):
@@ -68,10 +118,11 @@ class Connect4:
         self.restart_game()
         self.draw_board()
         ai = ai_class(self.board)
-        
+        worker = None  # Background search for the AI's move, polled once per frame
 
         total_ai_time = 0
         ai_moves = 0
+        reported = False
         
         while True:
             for event in pygame.event.get():
@@ -84,28 +135,31 @@ class Connect4:
                     self.draw_board()
                     total_ai_time = 0
                     ai_moves = 0
+                    reported = False
 
                 if event.type == pygame.MOUSEMOTION and not self.game_over:
                     col = event.pos[0] // SQ_SIZE
-                    self.draw_board(highlight_col=col)
+                    self.renderer.set_highlight(col)
 
-                if event.type == pygame.MOUSEBUTTONDOWN and not self.game_over:
+                if event.type == pygame.MOUSEBUTTONDOWN and not self.game_over and not self.renderer.animating:
                     col = event.pos[0] // SQ_SIZE
                     if 0 <= col < COLS:
                         if self.current_player == PLAYER_TURN:
                             self.make_move(col)
-                            
-            if self.current_player == AI_TURN and not self.game_over:
-                start = time.time()
-                col = ai.get_move(self.board)
-                end = time.time()
-                if col is not None:
-                    total_ai_time += (end - start)
-                    ai_moves += 1
-                    self.make_move(col)
+
+            if self.current_player == AI_TURN and not self.game_over and not self.renderer.animating:
+                if worker is None:
+                    worker = AIWorker(ai, self.board)
+                elif worker.done():
+                    col = worker.result()
+                    if col is not None:
+                        total_ai_time += worker.elapsed
+                        ai_moves += 1
+                        self.make_move(col)
+                    worker = None
 
             # End of game: show duration
-            if self.game_over:
+            if self.game_over and not reported:
                 if ai_moves > 0:
                     avg_time = total_ai_time / ai_moves
                     print(f"AI made {ai_moves} moves.")
@@ -113,11 +167,14 @@ class Connect4:
                     print(f"Average time per move: {avg_time:} seconds")
                 else:
                     print("AI made no moves.")
-                break
+                reported = True
+
+            self.renderer.update(self.board)
+            self.clock.tick(renderer.FPS)
 
 
-    def play_game(self, ai1_class, ai2_class, rounds):
-        """Simulate a series of games between two AIs."""
+    def play_game(self, ai1_class, ai2_class, rounds, opening=()):
+        """Simulate a series of games between two AIs, each starting with the `opening` columns."""
         results = {'ai1_wins': 0, 'ai2_wins': 0, 'draws': 0}
         timings = {
             'ai1_total_time': 0.0, 'ai1_moves': 0,
@@ -130,18 +187,19 @@ class Connect4:
             ai1, ai2 = ai1_class(self.board), ai2_class(self.board)
             self.current_player = PLAYER_TURN
             self.draw_board()
+            for col in opening:
+                if self.game_over:
+                    break
+                if col not in range(COLS) or not self.board.is_available_column(col):
+                    raise ValueError(f"Opening {list(opening)} plays column {col}, which is full or off the board")
+                self.make_move(col)
+            move_times = [0.0] * len(self.history)  # The opening may have ended the game early
 
             while not self.game_over:
-                pygame.event.pump()
-                for event in pygame.event.get():
-                    if event.type == pygame.QUIT:
-                        pygame.quit()
-                        sys.exit()
                 active_player = self.current_player
                 # Zaman ölçümü burada olacak
-                start_time = time.time()
-                self.handle_player_turn(ai1, ai2)
-                elapsed = time.time() - start_time
+                elapsed = self.handle_player_turn(ai1, ai2)
+                move_times.append(elapsed)
 
                 if active_player == PLAYER_TURN:
                     timings['ai1_total_time'] += elapsed
@@ -149,29 +207,53 @@ class Connect4:
                 else:
                     timings['ai2_total_time'] += elapsed
                     timings['ai2_moves'] += 1
+                self.run_frames(0.1)
 
             self.update_results(results)
-            time.sleep(0.5)
+            self.record_game(ai1_class, ai2_class, move_times)
+            self.run_frames(0.5)
 
         return results, timings
 
     def handle_player_turn(self, ai1, ai2):
-        """Handle the turn of the current player (either AI or human)."""
+        """Handle the turn of the current player (either AI or human), returning its thinking time."""
+        if self.game_over:
+            return 0.0
         # Check if it's the player's turn or the AI's turn
-        if self.current_player == PLAYER_TURN and not self.game_over:
-            col = ai1.get_move(self.board)
-
-            if col is not None:
-                self.make_move(col)
+        ai = ai1 if self.current_player == PLAYER_TURN else ai2
+        col, elapsed = self.think(ai)
 
-        # If it's the AI's turn, let the AI make a move
-        elif self.current_player == AI_TURN and not self.game_over:
-            col = ai2.get_move(self.board)
-
-            if col is not None:
-                self.make_move(col)
+        if col is not None:
+            self.make_move(col)
+        return elapsed
 
-        time.sleep(0.1)
+    def think(self, ai):
+        """Get the AI's move and its thinking time; with a window, search on an AIWorker and keep drawing frames."""
+        if not self.screen:
+            start = time.time()
+            col = ai.get_move(self.board)
+            return col, time.time() - start
+        worker = AIWorker(ai, self.board)
+        while not worker.done():
+            self.run_frames(1 / renderer.FPS)
+        return worker.result(), worker.elapsed
+
+    def record_game(self, ai1_class, ai2_class, move_times):
+        """Append the finished game to the recorder, if there is one."""
+        if self.recorder is None:
+            return
+        if self.board.has_won(PLAYER_TURN):
+            result = PLAYER_TURN
+        elif self.board.has_won(AI_TURN):
+            result = AI_TURN
+        else:
+            result = 0
+        self.recorder.append(GameRecord(
+            [col for _, col in self.history], result,
+            engines=[ai1_class.__name__, ai2_class.__name__],
+            params=[getattr(ai1_class, "params", {}), getattr(ai2_class, "params", {})],
+            timings=move_times,
+        ))
 
     def update_results(self, results):
         """Update the results dictionary based on the game outcome."""
@@ -215,45 +297,153 @@ class Connect4:
         print(f"{ai2_class.__name__} avg move time (as first player): {avg1_swapped:.4f} sec")
         print(f"{ai1_class.__name__} avg move time (as second player): {avg2_swapped:.4f} sec")
 
-        pygame.quit()
+        if pygame is not None:
+            pygame.quit()
 
     def restart_game(self):
         self.board = Board()
         self.current_player = PLAYER_TURN
         self.game_over = False
         self.history = []
+        if self.renderer:
+            self.renderer.reset()
 
     def animate_drop(self, col, final_row, player):
-        for temp_row in range(ROWS-1, ROWS-final_row, -1):
-            self.draw_board()
-            pygame.draw.circle(self.screen, RED if player == 1 else YELLOW,
-                            (col * SQ_SIZE + SQ_SIZE // 2, HEIGHT - (temp_row + 1) * SQ_SIZE + SQ_SIZE // 2), RADIUS)
-            pygame.display.update()
-            time.sleep(0.05)
+        """Start the drop animation; frames are drawn by the caller's loop."""
+        if not self.screen:
+            return
+        self.renderer.start_drop(col, final_row, player)
 
     
-def simulate_games(ai1_class, ai2_class):
-        game = Connect4()
-        game.play_ai_vs_ai(ai1_class, ai2_class)
+def simulate_games(ai1_class, ai2_class, rounds=1, headless=False, record_path=None):
+        recorder = GameRecordWriter(record_path) if record_path else None
+        game = Connect4(headless=headless, recorder=recorder)
+        try:
+            game.play_ai_vs_ai(ai1_class, ai2_class, rounds)
+        finally:
+            if recorder:
+                recorder.close()
+
+def print_records(path):
+    """Print each recorded game: engines, result, moves and total thinking time."""
+    with GameRecordReader(path) as reader:
+        for i, record in enumerate(reader):
+            result = {None: "unfinished", 0: "draw", PLAYER_TURN: "first player wins", AI_TURN: "second player wins"}[record.result]
+            moves = "".join(str(col) for col in record.moves)
+            print(f"{i}: {' vs '.join(record.engines)}, {result}, moves {moves}, {sum(record.timings):.2f}s")
+
+def measure_startup(runs=5):
+    """Time fresh interpreter launches of the CLI, bare and with each engine imported."""
+    def launch(*args):
+        timings = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            subprocess.run([sys.executable, __file__, "engines", *args], check=True, stdout=subprocess.DEVNULL)
+            timings.append(time.perf_counter() - start)
+        return min(timings) * 1000, sum(timings) / runs * 1000
+
+    best, mean = launch()
+    print(f"CLI startup: best {best:.1f} ms, mean {mean:.1f} ms over {runs} runs")
+    for name in ENGINES:
+        best, mean = launch("--load", name)
+        print(f"CLI startup + {name}: best {best:.1f} ms, mean {mean:.1f} ms")
+
+def parse_address(text):
+    host, _, port = text.rpartition(":")
+    return host or "localhost", int(port)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Connect 4 with AI engines.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    engine_help = "engine spec, e.g. mcts:time_limit=0.5 or iterative:max_depth=6,search_mode=pvs"
+
+    play = commands.add_parser("play", help="play against an engine in a window")
+    play.add_argument("engine", help=engine_help)
+
+    match = commands.add_parser("match", help="play two engines against each other, both colors")
+    match.add_argument("engine1", help=engine_help)
+    match.add_argument("engine2", help=engine_help)
+    match.add_argument("--rounds", type=int, default=1, help="games per color")
+    match.add_argument("--headless", action="store_true", help="run without opening a window")
+    match.add_argument("--record", metavar="FILE", help="append every game to a game record file")
+
+    sprt = commands.add_parser("sprt", help="test engine1 against engine2 until an SPRT decides")
+    sprt.add_argument("engine1", help=engine_help)
+    sprt.add_argument("engine2", help=engine_help)
+    sprt.add_argument("--elo0", type=float, default=0, help="Elo difference under H0")
+    sprt.add_argument("--elo1", type=float, default=10, help="Elo difference under H1")
+    sprt.add_argument("--alpha", type=float, default=0.05)
+    sprt.add_argument("--beta", type=float, default=0.05)
+    sprt.add_argument("--max-pairs", type=int, default=1000)
+    sprt.add_argument("--workers", type=int, default=None, help="worker processes (default: all CPUs)")
+    sprt.add_argument("--opening-plies", type=int, default=4, help="random plies before the engines play")
+    sprt.add_argument("--seed", type=int, default=None)
+    sprt.add_argument("--record", metavar="FILE", help="append every game to a game record file")
+
+    dmatch = commands.add_parser("dmatch", help="serve a match to distributed workers")
+    dmatch.add_argument("engine1", help=engine_help)
+    dmatch.add_argument("engine2", help=engine_help)
+    dmatch.add_argument("--pairs", type=int, default=10, help="color-swapped pairs to play")
+    dmatch.add_argument("--bind", default="localhost:0", help="HOST:PORT to serve work on")
+    dmatch.add_argument("--local-workers", type=int, default=0, help="worker processes to start on this machine")
+    dmatch.add_argument("--unit-timeout", type=float, default=None, help="seconds before a held unit is re-queued")
+    dmatch.add_argument("--opening-plies", type=int, default=4, help="random plies before the engines play")
+    dmatch.add_argument("--seed", type=int, default=None)
+    dmatch.add_argument("--record", metavar="FILE", help="append every game to a game record file")
+    dmatch.add_argument("--authkey", help="shared secret workers must present (default: a random key, printed)")
+
+    worker = commands.add_parser("worker", help="run work units for a coordinator")
+    worker.add_argument("address", help="coordinator HOST:PORT")
+    worker.add_argument("--authkey", required=True, help="shared secret printed by the coordinator")
+
+    replay = commands.add_parser("replay", help="list the games in a game record file")
+    replay.add_argument("path")
+
+    engines = commands.add_parser("engines", help="list the registered engines")
+    engines.add_argument("--load", metavar="NAME", help="import the engine's module (used by startup)")
+
+    startup = commands.add_parser("startup", help="measure CLI startup time")
+    startup.add_argument("--runs", type=int, default=5)
+
+    args = parser.parse_args(argv)
+    if args.command == "play":
+        Connect4().play(engine_factory(args.engine))
+    elif args.command == "match":
+        simulate_games(engine_factory(args.engine1), engine_factory(args.engine2), args.rounds, args.headless, args.record)
+    elif args.command == "sprt":
+        from tournament import run_sprt  # Imports the process pool machinery only when needed
+        stats, decision = run_sprt(args.engine1, args.engine2, args.elo0, args.elo1, args.alpha, args.beta,
+                                   args.max_pairs, args.workers, args.opening_plies, args.record, args.seed)
+        verdict = {"H1": "engine1 is stronger", "H0": "engine1 is not stronger", None: "undecided"}[decision]
+        print(f"SPRT after {len(stats.pair_scores)} pairs: {verdict}")
+    elif args.command == "dmatch":
+        import distributed  # Imports the networking machinery only when needed
+        authkey = args.authkey.encode() if args.authkey else None
+        with distributed.Coordinator(parse_address(args.bind), authkey, args.unit_timeout) as coordinator:
+            host, port = coordinator.address
+            print(f"Serving work on {host}:{port}")
+            if not args.authkey:
+                print(f"Join with: python connect_four.py worker {host}:{port} --authkey {coordinator.authkey.decode()}")
+            distributed.start_local_workers(coordinator.address, args.local_workers, coordinator.authkey)
+            recorder = GameRecordWriter(args.record) if args.record else None
+            try:
+                distributed.run_distributed_match(coordinator, args.engine1, args.engine2, args.pairs,
+                                                  args.opening_plies, args.seed, recorder)
+            finally:
+                if recorder:
+                    recorder.close()
+    elif args.command == "worker":
+        import distributed
+        distributed.run_worker(parse_address(args.address), args.authkey.encode())
+    elif args.command == "replay":
+        print_records(args.path)
+    elif args.command == "engines":
+        if args.load:
+            load_engine(args.load)
+        for name, (module_name, class_name) in ENGINES.items():
+            print(f"{name}: {module_name}.{class_name}")
+    elif args.command == "startup":
+        measure_startup(args.runs)
 
 if __name__ == "__main__":
-
-    game = Connect4()
-    #game.play(Minimax)
-    #game.play(GreedyAI)
-    #game.play(MonteCarloTreeSearch)
-    #game.play(IterativeDeepeningAI)
-
-    #simulate_games(Minimax, GreedyAI)
-    simulate_games(IterativeDeepeningAI, MonteCarloTreeSearch)
-
-
-    """simulate_games(Minimax, GreedyAI)
-    simulate_games(Minimax, MonteCarloTreeSearch)
-    simulate_games(Minimax, IterativeDeepeningAI)
-    simulate_games(GreedyAI, IterativeDeepeningAI)
-    simulate_games(GreedyAI, MonteCarloTreeSearch)
-    simulate_games(IterativeDeepeningAI, MonteCarloTreeSearch)"""
-
-
-
+    main()
@@ -0,0 +1,225 @@
+import multiprocessing
+import os
+import random
+import secrets
+import socket
+import struct
+import threading
+import time
+import traceback
+from collections import deque
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client, Listener, answer_challenge, deliver_challenge
+from game_record import GameRecord
+from engines import engine_factory
+from tournament import MatchStats, play_pair, random_opening
+
+def analyse_positions(spec, positions):
+    """Return the engine's move for each position, given as the column sequence that reaches it."""
+    make_engine = engine_factory(spec)
+    moves = []
+    for columns in positions:
+        board = GameRecord(columns).position(len(columns))
+        moves.append(make_engine(board).get_move(board))
+    return moves
+
+# Work unit kind -> function run by the worker with the unit's arguments
+WORK_HANDLERS = {
+    "pair": play_pair,
+    "analyse": analyse_positions,
+}
+
+HANDSHAKE_TIMEOUT = 10  # Seconds a connecting client gets to answer the authkey challenge
+
+class WorkUnitError(Exception):
+    """A work unit raised on the worker; the message is the worker's traceback."""
+
+class Coordinator:
+    def __init__(self, address=("localhost", 0), authkey=None, unit_timeout=None):
+        """Serve submitted work units to any worker that connects to `address` with the shared `authkey`.
+
+        Messages are pickles, so the key is what keeps strangers from running code on either side;
+        without one a random key is generated and left in `self.authkey` for the workers.
+        Units held by a worker that disconnects, or for longer than `unit_timeout` seconds,
+        go back on the queue; whichever copy finishes first is the result.
+        """
+        self.authkey = authkey or secrets.token_hex(16).encode()
+        self.listener = Listener(address)  # Authenticated per connection in serve_worker, not while accepting
+        self.address = self.listener.address
+        self.unit_timeout = unit_timeout
+        self.lock = threading.Condition()
+        self.queue = deque()  # Unit ids waiting for a worker
+        self.units = {}  # Unit id -> (kind, args) for every unit without a result yet
+        self.deadlines = {}  # Unit id -> time after which a handed-out unit is re-queued
+        self.holders = {}  # Unit id -> connection of the worker that was handed it last
+        self.finished = deque()  # (unit id, result) pairs not yet collected by results()
+        self.next_id = 0
+        self.closed = False
+        self.accept_thread = threading.Thread(target=self.accept_workers, daemon=True)
+        self.accept_thread.start()
+
+    def submit(self, kind, *args):
+        """Queue a unit of work, returning its id."""
+        if kind not in WORK_HANDLERS:
+            raise ValueError(f"Unknown work kind {kind!r}, expected one of {sorted(WORK_HANDLERS)}")
+        with self.lock:
+            unit_id = self.next_id
+            self.next_id += 1
+            self.units[unit_id] = (kind, args)
+            self.queue.append(unit_id)
+            self.lock.notify_all()
+        return unit_id
+
+    def results(self):
+        """Yield (unit id, result) as units finish, until every submitted unit is done."""
+        while True:
+            with self.lock:
+                while not self.finished and self.units:
+                    self.requeue_expired()
+                    self.lock.wait(timeout=0.5)
+                if not self.finished:
+                    return
+                unit_id, result = self.finished.popleft()
+            if isinstance(result, WorkUnitError):
+                raise result
+            yield unit_id, result
+
+    def close(self):
+        """Stop handing out work; idle workers are told to exit."""
+        with self.lock:
+            if self.closed:
+                return
+            self.closed = True
+            self.lock.notify_all()
+        # Closing the socket under a blocked accept() lets the thread pick up whatever socket reuses
+        # the descriptor, so wake it with a connection of our own and close only once it has stopped
+        try:
+            socket.create_connection(self.address).close()
+        except OSError:
+            pass
+        self.accept_thread.join()
+        self.listener.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def accept_workers(self):
+        while not self.closed:
+            try:
+                conn = self.listener.accept()
+            except OSError:
+                continue  # The client hung up before it was accepted
+            if self.closed:
+                conn.close()
+                return
+            threading.Thread(target=self.serve_worker, args=(conn,), daemon=True).start()
+
+    def authenticate(self, conn):
+        """Run the authkey handshake of Listener.accept(), giving up on a client that stays silent."""
+        # A receive timeout on the socket itself, as a timeout set through Python would make it non-blocking
+        with socket.socket(fileno=os.dup(conn.fileno())) as sock:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVTIMEO, struct.pack("ll", HANDSHAKE_TIMEOUT, 0))
+            deliver_challenge(conn, self.authkey)
+            answer_challenge(conn, self.authkey)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVTIMEO, struct.pack("ll", 0, 0))  # Units may take a while
+
+    def requeue_expired(self):
+        """Put units whose worker has held them past the timeout back on the queue. Call with the lock held."""
+        now = time.time()
+        for unit_id, deadline in list(self.deadlines.items()):
+            if deadline is not None and now > deadline and unit_id not in self.queue:
+                self.queue.append(unit_id)
+                self.deadlines[unit_id] = None
+                self.lock.notify_all()
+
+    def complete(self, unit_id, result):
+        with self.lock:
+            if unit_id not in self.units:
+                return  # A re-queued copy already finished
+            del self.units[unit_id]
+            self.deadlines.pop(unit_id, None)
+            self.holders.pop(unit_id, None)
+            if unit_id in self.queue:
+                self.queue.remove(unit_id)
+            self.finished.append((unit_id, result))
+            self.lock.notify_all()
+
+    def serve_worker(self, conn):
+        """Talk to one worker: every message it sends (ready, result or error) is answered with its next unit."""
+        current = None
+        try:
+            self.authenticate(conn)
+            while True:
+                message = conn.recv()
+                if message[0] == "result":
+                    self.complete(message[1], message[2])
+                    current = None
+                elif message[0] == "error":
+                    self.complete(message[1], WorkUnitError(message[2]))
+                    current = None
+
+                with self.lock:
+                    while not self.closed and not self.queue:
+                        self.requeue_expired()
+                        self.lock.wait(timeout=0.5)
+                    if self.closed:
+                        conn.send(("stop",))
+                        return
+                    current = self.queue.popleft()
+                    kind, args = self.units[current]
+                    self.deadlines[current] = time.time() + self.unit_timeout if self.unit_timeout else None
+                    self.holders[current] = conn
+                conn.send(("work", current, kind, args))
+        except (EOFError, OSError, AuthenticationError):
+            # The worker is gone, or was never let in; its unit goes back to the front of the queue unless another worker has it now
+            with self.lock:
+                if current in self.units and current not in self.queue and self.holders.get(current) is conn:
+                    self.queue.appendleft(current)
+                    self.deadlines.pop(current, None)
+                    self.holders.pop(current, None)
+                    self.lock.notify_all()
+        finally:
+            conn.close()
+
+def run_worker(address, authkey):
+    """Connect to a coordinator and run work units until it says stop or goes away."""
+    with Client(address, authkey=authkey) as conn:
+        try:
+            conn.send(("ready",))
+            while True:
+                message = conn.recv()
+                if message[0] == "stop":
+                    return
+                _, unit_id, kind, args = message
+                try:
+                    conn.send(("result", unit_id, WORK_HANDLERS[kind](*args)))
+                except Exception:
+                    conn.send(("error", unit_id, traceback.format_exc()))
+        except (EOFError, OSError):
+            return
+
+def start_local_workers(address, count, authkey):
+    """Start `count` worker processes on this machine, standing in for remote nodes."""
+    workers = [multiprocessing.Process(target=run_worker, args=(address, authkey), daemon=True) for _ in range(count)]
+    for worker in workers:
+        worker.start()
+    return workers
+
+def run_distributed_match(coordinator, spec1, spec2, pairs, opening_plies=4, seed=None, recorder=None):
+    """Play `pairs` color-swapped pairs through the coordinator's workers and return the MatchStats."""
+    rng = random.Random(seed)
+    for _ in range(pairs):
+        coordinator.submit("pair", spec1, spec2, random_opening(opening_plies, rng))
+    stats = MatchStats()
+    for _, records in coordinator.results():
+        if recorder:
+            for record in records:
+                recorder.append(record)
+        stats.add_pair(records)
+        elo_low, elo_high = stats.elo_interval()
+        print(f"Pair {len(stats.pair_scores)}/{pairs}: +{stats.wins} ={stats.draws} -{stats.losses}, "
+              f"Elo {stats.elo():.1f} [{elo_low:.1f}, {elo_high:.1f}]")
+    return stats
@@ -0,0 +1,44 @@
+import ast
+import importlib
+
+# Engine name -> (module, class). Modules are imported only when an engine is requested.
+ENGINES = {
+    "minimax": ("minimax", "Minimax"),
+    "greedy": ("greedy", "GreedyAI"),
+    "iterative": ("iterative_deepening", "IterativeDeepeningAI"),
+    "mcts": ("mcts", "MonteCarloTreeSearch"),
+}
+
+def load_engine(name):
+    """Import the engine's module on demand and return its class."""
+    if name not in ENGINES:
+        raise ValueError(f"Unknown engine {name!r}, expected one of {sorted(ENGINES)}")
+    module_name, class_name = ENGINES[name]
+    return getattr(importlib.import_module(module_name), class_name)
+
+def parse_engine_spec(spec):
+    """Split 'name:key=value,key=value' into the engine name and its keyword parameters."""
+    name, _, params_text = spec.partition(":")
+    params = {}
+    for item in filter(None, params_text.split(",")):
+        key, sep, value = item.partition("=")
+        if not sep:
+            raise ValueError(f"Engine parameter {item!r} must look like key=value")
+        try:
+            params[key.strip()] = ast.literal_eval(value.strip())
+        except (ValueError, SyntaxError):
+            params[key.strip()] = value.strip()  # Plain strings, e.g. search_mode=pvs
+    return name.strip(), params
+
+def engine_factory(spec):
+    """Return a callable that builds the engine from a spec, usable wherever an AI class is expected."""
+    name, params = parse_engine_spec(spec)
+    engine_class = load_engine(name)
+
+    def factory(game_board):
+        return engine_class(game_board, **params)
+
+    factory.__name__ = engine_class.__name__
+    factory.spec = spec
+    factory.params = params
+    return factory
@@ -0,0 +1,151 @@
+import json
+import mmap
+import os
+import struct
+from board import *
+
+FILE_MAGIC = b"C4GR\x02\x00\x00\x00"  # Format name and version, written once at the start of a file
+RECORD_HEADER = struct.Struct("<IHBB")  # Record length, metadata index, result, move count
+NO_RESULT = 255  # Result byte of an unfinished game; otherwise the winning player, or 0 for a draw
+METADATA = 254  # Result byte of a metadata record, which binds its index to engine names and parameters
+MAX_METADATA_INDEX = 0xFFFF
+MAX_TIMING_MS = 0xFFFF  # Move timings are stored as uint16 milliseconds and saturate here
+
+class GameRecord:
+    def __init__(self, moves, result=None, engines=(), params=(), timings=()):
+        """A finished or unfinished game: the column sequence, starting with PLAYER_TURN, and its metadata."""
+        self.moves = list(moves)
+        self.result = result  # Winning player, 0 for a draw, None if unfinished
+        self.engines = list(engines)  # Engine names, first player first
+        self.params = list(params)  # Constructor parameters of each engine
+        self.timings = list(timings)  # Seconds spent on each move
+
+    def positions(self):
+        """Yield the board after each move, rebuilt incrementally as the iterator advances."""
+        board = Board()
+        player = PLAYER_TURN
+        for col in self.moves:
+            board.place_piece(board.get_available_row(col), col, player)
+            player = 3 - player
+            yield board.copy()
+
+    def position(self, ply):
+        """Return the board after the first `ply` moves."""
+        board = Board()
+        for i, col in enumerate(self.moves[:ply]):
+            board.place_piece(board.get_available_row(col), col, PLAYER_TURN if i % 2 == 0 else AI_TURN)
+        return board
+
+def encode_record(record, meta_index=0):
+    """Pack a record: header, moves as 4-bit columns, then uint16 millisecond timings.
+
+    The engines and params are not stored in the record but in the metadata record bound to `meta_index`.
+    Timings must be given for every move, or not at all (stored as zeros).
+    """
+    if record.timings and len(record.timings) != len(record.moves):
+        raise ValueError(f"Got {len(record.timings)} timings for {len(record.moves)} moves")
+    if any(col not in range(COLS) for col in record.moves):
+        raise ValueError(f"Moves must be columns 0-{COLS - 1}: {record.moves}")
+    moves = record.moves + [0] * (len(record.moves) % 2)
+    packed_moves = bytes(moves[i] | moves[i + 1] << 4 for i in range(0, len(moves), 2))
+    timings = record.timings if record.timings else [0] * len(record.moves)
+    packed_timings = struct.pack(f"<{len(timings)}H", *(min(int(t * 1000), MAX_TIMING_MS) for t in timings))
+    result = NO_RESULT if record.result is None else record.result
+    length = RECORD_HEADER.size + len(packed_moves) + len(packed_timings)
+    return RECORD_HEADER.pack(length, meta_index, result, len(record.moves)) + packed_moves + packed_timings
+
+def encode_metadata(meta_index, engines, params):
+    """Pack a metadata record: header, then the engines and params as JSON."""
+    meta = json.dumps({"engines": engines, "params": params}, separators=(",", ":")).encode()
+    return RECORD_HEADER.pack(RECORD_HEADER.size + len(meta), meta_index, METADATA, 0) + meta
+
+def decode_metadata(buffer, offset=0):
+    """Unpack the metadata record at `offset`, returning (meta index, engines, params, offset of the next record)."""
+    length, meta_index, _, _ = RECORD_HEADER.unpack_from(buffer, offset)
+    meta = json.loads(bytes(buffer[offset + RECORD_HEADER.size:offset + length]))
+    return meta_index, meta["engines"], meta["params"], offset + length
+
+def decode_record(buffer, offset=0, engines=(), params=()):
+    """Unpack the game record at `offset` of a bytes-like buffer, returning (record, offset of the next record).
+
+    `engines` and `params` come from the metadata record bound to the record's meta index.
+    """
+    length, _, result, move_count = RECORD_HEADER.unpack_from(buffer, offset)
+    position = offset + RECORD_HEADER.size
+    packed_moves = buffer[position:position + (move_count + 1) // 2]
+    moves = [packed_moves[i // 2] >> 4 * (i % 2) & 0xF for i in range(move_count)]
+    position += len(packed_moves)
+    timings = [ms / 1000 for ms in struct.unpack_from(f"<{move_count}H", buffer, position)]
+    record = GameRecord(moves, None if result == NO_RESULT else result, engines, params, timings)
+    return record, offset + length
+
+class GameRecordWriter:
+    def __init__(self, path):
+        """Append records to `path`, creating it with the format header if needed.
+
+        Each distinct (engines, params) is written once, as a metadata record before its first game.
+        A reader uses the latest binding of an index, so a reopened file simply binds indexes afresh.
+        """
+        self.file = open(path, "a+b")
+        self.file.seek(0)
+        magic = self.file.read(len(FILE_MAGIC))
+        if not magic:
+            self.file.write(FILE_MAGIC)
+        elif magic != FILE_MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a game record file of this version")
+        self.metadata = {}  # JSON of (engines, params) -> meta index bound in this file
+
+    def append(self, record):
+        key = json.dumps([record.engines, record.params], separators=(",", ":"))
+        meta_index = self.metadata.get(key)
+        if meta_index is None:
+            if len(self.metadata) > MAX_METADATA_INDEX:
+                self.metadata.clear()  # Rebind indexes from 0
+            meta_index = self.metadata[key] = len(self.metadata)
+            self.file.write(encode_metadata(meta_index, record.engines, record.params))
+        self.file.write(encode_record(record, meta_index))
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+class GameRecordReader:
+    def __init__(self, path):
+        """Memory-map a record file; records are decoded only as they are iterated."""
+        self.file = open(path, "rb")
+        size = os.fstat(self.file.fileno()).st_size
+        self.buffer = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+        if self.buffer[:len(FILE_MAGIC)] != FILE_MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a game record file of this version")
+
+    def __iter__(self):
+        metadata = {}  # Meta index -> (engines, params), from the metadata records read so far
+        offset = len(FILE_MAGIC)
+        while offset < len(self.buffer):
+            _, meta_index, result, _ = RECORD_HEADER.unpack_from(self.buffer, offset)
+            if result == METADATA:
+                meta_index, engines, params, offset = decode_metadata(self.buffer, offset)
+                metadata[meta_index] = (engines, params)
+                continue
+            if meta_index not in metadata:
+                raise ValueError(f"Record at offset {offset} uses metadata index {meta_index} before it is bound")
+            record, offset = decode_record(self.buffer, offset, *metadata[meta_index])
+            yield record
+
+    def close(self):
+        if isinstance(self.buffer, mmap.mmap):
+            self.buffer.close()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
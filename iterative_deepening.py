@@ -1,15 +1,28 @@
 import math
 from board import *
 
+SEARCH_MODES = ("alphabeta", "pvs", "mtdf", "aspiration")
+CENTER_ORDER = [3, 2, 4, 1, 5, 0, 6]  # Center columns first, so the best move tends to be searched first
+WIN_SCORE = 1000000  # Magnitude of evaluate_board's win/loss penalties; wider aspiration windows open fully
+
 class IterativeDeepeningAI:
-    def __init__(self, game_board, max_depth=7):
+    def __init__(self, game_board, max_depth=7, search_mode="alphabeta", aspiration_window=5000):
+        if search_mode not in SEARCH_MODES:
+            raise ValueError(f"Unknown search mode {search_mode!r}, expected one of {SEARCH_MODES}")
         self.game_board = game_board
         self.max_depth = max_depth  # Maximum depth for search
+        self.search_mode = search_mode  # Plain alpha-beta or one of the null-window searches
+        self.aspiration_window = aspiration_window  # Half-width of the window around the last score
+        self.nodes_searched = 0  # Nodes visited by the last get_move, for benchmarking modes
+        self.table = {}  # Transposition table: position key -> (depth, lower bound, upper bound, best move)
 
     def get_move(self, game_board):
         """Perform Iterative Deepening DFS to find the best move."""
         self.game_board = game_board
+        self.nodes_searched = 0
+        self.table = {}
         best_move = None
+        guess = None
 
         # Check for forced moves (win or block)
         forced_move = self.check_for_forced_move()
@@ -19,13 +32,51 @@ class IterativeDeepeningAI:
         # If no forced moves, proceed with iterative deepening search
         depth = 1
         while depth <= self.max_depth:
-            move = self.depth_limited_search(depth, True, -math.inf, math.inf)
+            move, score = self.search_iteration(depth, guess)
             if move is not None:
                 best_move = move
+                guess = score  # Seed the next iteration's window with this score
             depth += 1
 
         return best_move
 
+    def search_iteration(self, depth, guess):
+        """Search one iteration with the configured mode, returning (move, score)."""
+        if guess is None or self.search_mode in ("alphabeta", "pvs"):
+            return self.depth_limited_search(depth, True, -math.inf, math.inf)
+        if self.search_mode == "mtdf":
+            return self.mtdf(depth, guess)
+        return self.aspiration_search(depth, guess)
+
+    def aspiration_search(self, depth, guess):
+        """Search a window around the last score, doubling the side that fails until the score lands inside."""
+        delta = self.aspiration_window
+        alpha, beta = guess - delta, guess + delta
+        while True:
+            move, score = self.depth_limited_search(depth, True, alpha, beta)
+            if alpha < score < beta:
+                return move, score
+            delta *= 2
+            if score <= alpha:
+                alpha = -math.inf if delta > WIN_SCORE else guess - delta
+            else:
+                beta = math.inf if delta > WIN_SCORE else guess + delta
+
+    def mtdf(self, depth, guess):
+        """MTD(f): converge on the minimax score with a series of null-window searches."""
+        lower, upper = -math.inf, math.inf
+        best_move = None
+        score = guess
+        while lower < upper:
+            beta = score + 1 if score == lower else score
+            move, score = self.depth_limited_search(depth, True, beta - 1, beta)
+            if score < beta:
+                upper = score
+            else:
+                lower = score
+                best_move = move  # A fail-high proves this move reaches the lower bound
+        return best_move, score
+
 
     def check_for_forced_move(self):
         """Check for forced winning or blocking moves."""
@@ -50,9 +101,13 @@ class IterativeDeepeningAI:
 
 
     def depth_limited_search(self, depth, is_max_player, alpha, beta):
-        """Perform Depth-First Search with depth limit and Alpha-Beta Pruning."""
+        """Perform Depth-First Search with depth limit and Alpha-Beta Pruning, returning (move, score)."""
         valid_moves = self.order_moves(self.game_board.find_available_columns())
+        _, hash_move = self.probe(self.game_board, depth, alpha, beta)
+        valid_moves = self.hash_move_first(valid_moves, hash_move)
+        alpha_orig, beta_orig = alpha, beta
         best_move = None
+        search = self.pvs if self.search_mode == "pvs" else self.minimax
 
         if is_max_player:
             max_score = float('-inf')
@@ -61,7 +116,10 @@ class IterativeDeepeningAI:
                 row = temp_board.get_available_row(col)
                 temp_board.place_piece(row, col, AI_TURN)
 
-                current_score = self.minimax(temp_board, depth - 1, False, alpha, beta)
+                if search == self.pvs and best_move is not None:
+                    current_score = self.scout(temp_board, depth - 1, False, alpha, beta)
+                else:
+                    current_score = search(temp_board, depth - 1, False, alpha, beta)
 
                 if current_score > max_score:
                     max_score = current_score
@@ -70,7 +128,8 @@ class IterativeDeepeningAI:
                 if beta <= alpha:
                     break  # Alpha cut-off
 
-            return best_move
+            self.store(self.game_board, depth, alpha_orig, beta_orig, max_score, best_move)
+            return best_move, max_score
         else:
             min_score = float('inf')
             for col in valid_moves:
@@ -78,7 +137,10 @@ class IterativeDeepeningAI:
                 row = temp_board.get_available_row(col)
                 temp_board.place_piece(row, col, PLAYER_TURN)
 
-                current_score = self.minimax(temp_board, depth - 1, True, alpha, beta)
+                if search == self.pvs and best_move is not None:
+                    current_score = self.scout(temp_board, depth - 1, True, alpha, beta)
+                else:
+                    current_score = search(temp_board, depth - 1, True, alpha, beta)
 
                 if current_score < min_score:
                     min_score = current_score
@@ -87,40 +149,130 @@ class IterativeDeepeningAI:
                 if beta <= alpha:
                     break  # Beta cut-off
 
-            return best_move
+            self.store(self.game_board, depth, alpha_orig, beta_orig, min_score, best_move)
+            return best_move, min_score
 
     def minimax(self, board, depth, is_maximizing, alpha, beta):
         """Minimax with Alpha-Beta Pruning for DFS search."""
+        self.nodes_searched += 1
         if depth == 0 or board.is_game_over(board):
             return self.evaluate_board(board)
 
-        valid_moves = board.find_available_columns()
+        score, hash_move = self.probe(board, depth, alpha, beta)
+        if score is not None:
+            return score
+        valid_moves = self.hash_move_first(self.center_first(board.find_available_columns()), hash_move)
+        alpha_orig, beta_orig = alpha, beta
 
         if is_maximizing:
-            max_eval = float('-inf')
+            max_eval, best_col = float('-inf'), None
             for col in valid_moves:
                 temp_board = board.copy()
                 row = temp_board.get_available_row(col)
                 temp_board.place_piece(row, col, AI_TURN)
                 eval = self.minimax(temp_board, depth - 1, False, alpha, beta)
-                max_eval = max(max_eval, eval)
+                if eval > max_eval:
+                    max_eval, best_col = eval, col
                 alpha = max(alpha, eval)
                 if beta <= alpha:
                     break  # Alpha cut-off
+            self.store(board, depth, alpha_orig, beta_orig, max_eval, best_col)
             return max_eval
         else:
-            min_eval = float('inf')
+            min_eval, best_col = float('inf'), None
             for col in valid_moves:
                 temp_board = board.copy()
                 row = temp_board.get_available_row(col)
                 temp_board.place_piece(row, col, PLAYER_TURN)
                 eval = self.minimax(temp_board, depth - 1, True, alpha, beta)
-                min_eval = min(min_eval, eval)
+                if eval < min_eval:
+                    min_eval, best_col = eval, col
                 beta = min(beta, eval)
                 if beta <= alpha:
                     break  # Beta cut-off
+            self.store(board, depth, alpha_orig, beta_orig, min_eval, best_col)
             return min_eval
 
+    def pvs(self, board, depth, is_maximizing, alpha, beta):
+        """Principal Variation Search: full window for the first child, null windows for the rest."""
+        self.nodes_searched += 1
+        if depth == 0 or board.is_game_over(board):
+            return self.evaluate_board(board)
+
+        score, hash_move = self.probe(board, depth, alpha, beta)
+        if score is not None:
+            return score
+        valid_moves = self.hash_move_first(self.center_first(board.find_available_columns()), hash_move)
+        alpha_orig, beta_orig = alpha, beta
+        piece = AI_TURN if is_maximizing else PLAYER_TURN
+        best_eval, best_col = (float('-inf') if is_maximizing else float('inf')), None
+
+        for i, col in enumerate(valid_moves):
+            temp_board = board.copy()
+            row = temp_board.get_available_row(col)
+            temp_board.place_piece(row, col, piece)
+            if i == 0:
+                eval = self.pvs(temp_board, depth - 1, not is_maximizing, alpha, beta)
+            else:
+                eval = self.scout(temp_board, depth - 1, not is_maximizing, alpha, beta)
+
+            if is_maximizing:
+                if eval > best_eval:
+                    best_eval, best_col = eval, col
+                alpha = max(alpha, eval)
+            else:
+                if eval < best_eval:
+                    best_eval, best_col = eval, col
+                beta = min(beta, eval)
+            if beta <= alpha:
+                break  # Cut-off
+        self.store(board, depth, alpha_orig, beta_orig, best_eval, best_col)
+        return best_eval
+
+    def scout(self, board, depth, is_maximizing, alpha, beta):
+        """Test a non-principal child with a null window and re-search only if it lands inside (alpha, beta)."""
+        # A minimizing parent only asks whether the child beats beta, a maximizing one whether it beats alpha
+        if is_maximizing:
+            eval = self.pvs(board, depth, is_maximizing, beta - 1, beta)
+        else:
+            eval = self.pvs(board, depth, is_maximizing, alpha, alpha + 1)
+        if alpha < eval < beta:
+            eval = self.pvs(board, depth, is_maximizing, alpha, beta)
+        return eval
+
+    def probe(self, board, depth, alpha, beta):
+        """Look the position up in the transposition table, returning (score if it settles the window, best move)."""
+        # Keyed on key(), not canonical_key(): evaluate_position can return a column index, so a position and
+        # its mirror need not score the same, and sharing their entries would change the search's results
+        entry = self.table.get(board.key())
+        if entry is None:
+            return None, None
+        entry_depth, lower, upper, best_move = entry
+        # Bounds are only reused at the same depth, so every mode returns the scores of a plain fixed-depth search
+        if entry_depth == depth:
+            if lower >= beta:
+                return lower, best_move
+            if upper <= alpha:
+                return upper, best_move
+            if lower == upper:
+                return lower, best_move
+        return None, best_move
+
+    def store(self, board, depth, alpha, beta, score, best_move):
+        """Record a fail-soft result: an upper bound if it failed low, a lower bound if it failed high."""
+        lower = score if score > alpha else -math.inf
+        upper = score if score < beta else math.inf
+        key = board.key()
+        entry = self.table.get(key)
+        if entry is not None and entry[0] == depth:
+            lower, upper = max(lower, entry[1]), min(upper, entry[2])  # Narrow the bounds from earlier passes
+        self.table[key] = (depth, lower, upper, best_move)
+
+    def hash_move_first(self, moves, hash_move):
+        if hash_move in moves:
+            return [hash_move] + [move for move in moves if move != hash_move]
+        return moves
+
     def evaluate_board(self, board):
         """Evaluate board position for AI."""
         score = 0
@@ -190,7 +342,8 @@ class IterativeDeepeningAI:
             move_scores[move] = 0
 
         # Apply custom column order (if no immediate win or block)
-        custom_order = [3, 2, 4, 1, 5, 0, 6]
-        ordered_moves = [move for move in custom_order if move in available_moves]
+        return self.center_first(available_moves)
 
-        return ordered_moves
+    def center_first(self, available_moves):
+        """Sort moves by CENTER_ORDER."""
+        return [move for move in CENTER_ORDER if move in available_moves]
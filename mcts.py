@@ -2,83 +2,135 @@ import time
 import random
 import math
 from board import *
+from minimax import Minimax
 
 class MCTSNode:
-    def __init__(self, board, move=None, parent=None):
+    def __init__(self, board, move=None, parent=None, player=PLAYER_TURN):
         self.board = board
         self.move = move
         self.parent = parent
+        self.player = player  # Player who made `move`; the root's player is the one who moved last
         self.children = []
+        self.untried_moves = None  # Filled by the search, in the order children are expanded
         self.wins = 0
         self.visits = 0
+        self.rave_wins = 0  # All-moves-as-first statistics: playouts in which `player` played `move` later on
+        self.rave_visits = 0
 
-    def is_fully_expanded(self):
-        """Check if all possible moves have been explored"""
+    def is_fully_expanded(self, max_children=None):
+        """Check if all possible moves have been explored, or the widening limit has been reached"""
+        if max_children is not None and len(self.children) >= max_children:
+            return True
         available_moves = self.board.find_available_columns()
         tried_moves = {child.move for child in self.children}
         return all(move in tried_moves for move in available_moves)
 
 
-    def best_child(self, exploration_weight=1.41):
+    def best_child(self, exploration_weight=1.41, rave_equivalence=0):
         """Select the child node with the best UCT score"""
-        return max(self.children, key=lambda child: child.uct_score(exploration_weight))
+        return max(self.children, key=lambda child: child.uct_score(exploration_weight, rave_equivalence))
 
-    def uct_score(self, exploration_weight=1.41):
-        """Calculate Upper Confidence Bound (UCT) score"""
+    def uct_score(self, exploration_weight=1.41, rave_equivalence=0):
+        """Calculate Upper Confidence Bound (UCT) score, blended with the RAVE value when enabled"""
         if self.visits == 0:
             return float('inf')  # Encourage exploration of unvisited nodes
-        return (self.wins / self.visits) + exploration_weight * math.sqrt(math.log(self.parent.visits) / self.visits)
+        value = self.wins / self.visits
+        if rave_equivalence and self.rave_visits:
+            # Trust RAVE early on and shift to the node's own value as its visits grow
+            beta = math.sqrt(rave_equivalence / (3 * self.visits + rave_equivalence))
+            value = (1 - beta) * value + beta * (self.rave_wins / self.rave_visits)
+        return value + exploration_weight * math.sqrt(math.log(self.parent.visits) / self.visits)
 
 class MonteCarloTreeSearch:
-    def __init__(self, game_board, iterations=1000, time_limit=2, exploration_weight=1.0):
+    def __init__(self, game_board, iterations=1000, time_limit=2, exploration_weight=1.0,
+                 rave_equivalence=0, prior_visits=0, widening=None, max_nodes=None):
         self.game_board = game_board
         self.iterations = iterations
         self.time_limit = time_limit
         self.exploration_weight = exploration_weight
+        self.rave_equivalence = rave_equivalence  # Visits at which RAVE and UCT values weigh equally, 0 disables RAVE
+        self.prior_visits = prior_visits  # Virtual visits seeded from the Minimax window heuristic, 0 disables priors
+        self.widening = widening  # Progressive widening exponent: a node may have 1 + visits ** widening children
+        self.max_nodes = max_nodes  # Tree size ceiling; least-visited subtrees are pruned when it is reached
+        self.heuristic = Minimax(game_board) if prior_visits else None
+        self.node_count = 0
 
     def get_move(self, game_board):
         self.game_board = game_board
         return self.search()
 
     def search(self):
-        root = MCTSNode(self.game_board.copy())
+        board = self.game_board.copy()
+        # The root's player is the one who moved last: whoever has more pieces, or AI_TURN on equal counts
+        last_mover = PLAYER_TURN if (board.board == PLAYER_TURN).sum() > (board.board == AI_TURN).sum() else AI_TURN
+        root = MCTSNode(board, player=last_mover)
+        self.node_count = 1
         start_time = time.time()
 
         for _ in range(self.iterations):
             if time.time() - start_time > self.time_limit:
                 break
             self.simulate(root)
+            if self.max_nodes is not None and self.node_count > self.max_nodes:
+                self.prune(root)
 
         return root.best_child(exploration_weight=0).move  # Greedy selection at the end
 
     def simulate(self, node):
         selected_node = self.selection(node)
-        result = self.rollout(selected_node)
-        self.backpropagate(selected_node, result)
+        result, playout_moves = self.rollout(selected_node)
+        self.backpropagate(selected_node, result, playout_moves)
+
+    def max_children(self, node):
+        if self.widening is None:
+            return None
+        return 1 + int(node.visits ** self.widening)
 
     def selection(self, node):
-        while node.is_fully_expanded() and node.children:
+        while node.is_fully_expanded(self.max_children(node)) and node.children:
             unvisited = [child for child in node.children if child.visits == 0]
             if unvisited:
                 return random.choice(unvisited)
-            node = node.best_child(exploration_weight=self.exploration_weight)
+            node = node.best_child(self.exploration_weight, self.rave_equivalence)
         return self.expand(node)
 
     def expand(self, node):
-        untried_moves = [m for m in node.board.find_available_columns() if m not in [child.move for child in node.children]]
-        if untried_moves:
-            move = random.choice(untried_moves)
+        if node.untried_moves is None:
+            node.untried_moves = self.order_untried_moves(node)
+        tried_moves = {child.move for child in node.children}
+        untried_moves = [m for m in node.untried_moves if m not in tried_moves]
+        if untried_moves and not node.board.is_game_over(node.board):
+            move = untried_moves[0]
+            player = 3 - node.player
             new_board = node.board.copy()
             row = new_board.get_available_row(move)
-            new_board.place_piece(row, move, AI_TURN)
-            child_node = MCTSNode(new_board, move, node)
+            new_board.place_piece(row, move, player)
+            child_node = MCTSNode(new_board, move, node, player)
+            if self.prior_visits:
+                child_node.visits = self.prior_visits
+                child_node.wins = self.prior_visits * self.prior_value(new_board, player)
             node.children.append(child_node)
+            self.node_count += 1
             return child_node
         return node
 
+    def order_untried_moves(self, node):
+        """Expansion order: best prior first when priors are enabled, otherwise random."""
+        moves = node.board.find_available_columns()
+        if not self.prior_visits:
+            random.shuffle(moves)
+            return moves
+        player = 3 - node.player
+        return sorted(moves, key=lambda move: -self.prior_value(self.heuristic.simulate_move(node.board, move, player), player))
+
+    def prior_value(self, board, player):
+        """Squash the Minimax window heuristic into a win rate in [-1, 1] for `player`."""
+        return math.tanh(self.heuristic.score_position(board.board, player) / 50)
+
     def rollout(self, node):
         temp_board = node.board.copy()
-        current_turn = PLAYER_TURN
+        current_turn = 3 - node.player  # Side to move at the node, not always PLAYER_TURN
+        playout_moves = []
 
         while not temp_board.is_draw() and not temp_board.has_won(AI_TURN) and not temp_board.has_won(PLAYER_TURN):
             available_moves = temp_board.find_available_columns()
@@ -92,12 +144,12 @@ class MonteCarloTreeSearch:
                     move_to_play = move
                     break
             else:
-                # Then, block opponent's win
+                # Then, block opponent's win: the opponent of whoever is moving, for both sides
                 for move in available_moves:
                     temp_board_copy = temp_board.copy()
                     row = temp_board_copy.get_available_row(move)
-                    temp_board_copy.place_piece(row, move, PLAYER_TURN)
-                    if temp_board_copy.has_won(PLAYER_TURN):
+                    temp_board_copy.place_piece(row, move, 3 - current_turn)
+                    if temp_board_copy.has_won(3 - current_turn):
                         move_to_play = move
                         break
                 else:
@@ -105,17 +157,53 @@ class MonteCarloTreeSearch:
 
             row = temp_board.get_available_row(move_to_play)
             temp_board.place_piece(row, move_to_play, current_turn)
+            playout_moves.append((current_turn, move_to_play))
             current_turn = AI_TURN if current_turn == PLAYER_TURN else PLAYER_TURN
 
         if temp_board.has_won(AI_TURN):
-            return 1
+            return 1, playout_moves
         elif temp_board.has_won(PLAYER_TURN):
-            return -1  
-        return 0  # Draw
+            return -1, playout_moves
+        return 0, playout_moves  # Draw
 
-    def backpropagate(self, node, result):
-        """Update node statistics and penalize bad losses more."""
+    def backpropagate(self, node, result, playout_moves):
+        """Update node statistics from each node's own point of view, plus the RAVE statistics of its children."""
+        moves_after = set(playout_moves)  # (player, move) pairs played below the current node
         while node is not None:
             node.visits += 1
-            node.wins += result
+            node.wins += result if node.player == AI_TURN else -result
+            if self.rave_equivalence:
+                for child in node.children:
+                    if (child.player, child.move) in moves_after:
+                        child.rave_visits += 1
+                        child.rave_wins += result if child.player == AI_TURN else -result
+            if node.move is not None:
+                moves_after.add((node.player, node.move))
             node = node.parent
+
+    def prune(self, root, keep_fraction=0.75):
+        """Drop the subtrees of the least-visited nodes until the tree is back under the node ceiling."""
+        target = int(self.max_nodes * keep_fraction)
+        internal_nodes = []
+        stack = [(child, 1) for child in root.children]  # Root's children keep their statistics for the final choice
+        while stack:
+            node, depth = stack.pop()
+            if node.children:
+                internal_nodes.append((node.visits, -depth, node))
+                stack.extend((child, depth + 1) for child in node.children)
+
+        # A node never has more visits than its parent, so deeper subtrees are cut before their ancestors
+        for _, _, node in sorted(internal_nodes, key=lambda entry: entry[:2]):
+            if self.node_count <= target:
+                break
+            self.node_count -= self.subtree_size(node) - 1
+            node.children = []
+            node.untried_moves = None
+
+    def subtree_size(self, node):
+        size, stack = 0, [node]
+        while stack:
+            current = stack.pop()
+            size += 1
+            stack.extend(current.children)
+        return size
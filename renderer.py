@@ -0,0 +1,118 @@
+import time
+import pygame
+from board import *
+
+FPS = 60
+DROP_SPEED = 20  # Rows per second, the same pace as the old 0.05s-per-frame animation
+TRANSPARENT = (0, 0, 0, 0)
+
+class DropAnimation:
+    def __init__(self, col, row, player):
+        self.col = col
+        self.row = row
+        self.player = player
+        self.start = time.time()
+
+    def position(self):
+        """Current row of the falling disc, starting in the top bar (row -1)."""
+        return min(-1 + (time.time() - self.start) * DROP_SPEED, self.row)
+
+    def is_done(self):
+        return self.position() >= self.row
+
+class Renderer:
+    def __init__(self, screen, font):
+        """Pre-render the board and discs once; frames only redraw the rectangles that changed."""
+        self.screen = screen
+        self.font = font
+        self.column_surfaces = {color: self.make_column_surface(color) for color in (BLUE, GRAY)}
+        self.disc_surfaces = {PLAYER_TURN: self.make_disc_surface(RED), AI_TURN: self.make_disc_surface(YELLOW)}
+        self.highlight_col = None
+        self.animations = []
+        self.message = None
+        self.dirty = []
+        self.invalidate()
+
+    def make_column_surface(self, color):
+        """One column of the board frame with transparent holes, drawn over the discs."""
+        surface = pygame.Surface((SQ_SIZE, ROWS * SQ_SIZE), pygame.SRCALPHA)
+        for r in range(ROWS):
+            pygame.draw.rect(surface, color, (0, r * SQ_SIZE, SQ_SIZE, SQ_SIZE), border_radius=10)
+            pygame.draw.circle(surface, TRANSPARENT, (SQ_SIZE // 2, r * SQ_SIZE + SQ_SIZE // 2), RADIUS)
+        return surface
+
+    def make_disc_surface(self, color):
+        surface = pygame.Surface((SQ_SIZE, SQ_SIZE), pygame.SRCALPHA)
+        pygame.draw.circle(surface, color, (SQ_SIZE // 2, SQ_SIZE // 2), RADIUS)
+        return surface
+
+    @property
+    def animating(self):
+        return bool(self.animations)
+
+    def column_rect(self, col):
+        return pygame.Rect(col * SQ_SIZE, 0, SQ_SIZE, HEIGHT)
+
+    def invalidate(self):
+        """Mark the whole window for redrawing."""
+        self.dirty = [pygame.Rect(0, 0, WIDTH, HEIGHT)]
+
+    def reset(self):
+        """Drop running animations and the message for a new game."""
+        self.animations = []
+        self.message = None
+        self.invalidate()
+
+    def show_message(self, text, color):
+        """Show a message in the top bar once running animations have finished."""
+        self.message = self.font.render(text, True, color)
+        self.dirty.append(pygame.Rect(0, 0, WIDTH, SQ_SIZE))
+
+    def set_highlight(self, col):
+        if col == self.highlight_col:
+            return
+        for c in (self.highlight_col, col):
+            if c is not None and 0 <= c < COLS:
+                self.dirty.append(self.column_rect(c))
+        self.highlight_col = col
+
+    def start_drop(self, col, row, player):
+        """Animate a disc falling into (row, col) without blocking the caller."""
+        self.animations.append(DropAnimation(col, row, player))
+
+    def update(self, board):
+        """Advance animations and redraw the dirty rectangles of the window."""
+        for animation in self.animations:
+            self.dirty.append(self.column_rect(animation.col))
+        finished = [animation for animation in self.animations if animation.is_done()]
+        if finished:
+            self.animations = [animation for animation in self.animations if animation not in finished]
+            if not self.animations and self.message:
+                self.dirty.append(pygame.Rect(0, 0, WIDTH, SQ_SIZE))
+
+        if not self.dirty:
+            return
+        for rect in self.dirty:
+            self.draw_rect(board, rect)
+        self.screen.set_clip(None)
+        pygame.display.update(self.dirty)
+        self.dirty = []
+
+    def draw_rect(self, board, rect):
+        self.screen.set_clip(rect)
+        self.screen.fill(BLACK, rect)
+        if self.message and not self.animations:
+            self.screen.blit(self.message, (WIDTH // 2 - self.message.get_width() // 2, SQ_SIZE // 4))
+
+        falling = {(animation.row, animation.col) for animation in self.animations}
+        for c in range(rect.left // SQ_SIZE, min(COLS, (rect.right - 1) // SQ_SIZE + 1)):
+            for r in range(ROWS):
+                piece = board.board[r][c]
+                if piece != 0 and (r, c) not in falling:
+                    self.screen.blit(self.disc_surfaces[piece], (c * SQ_SIZE, r * SQ_SIZE + SQ_SIZE))
+            for animation in self.animations:
+                if animation.col == c:
+                    y = int(animation.position() * SQ_SIZE) + SQ_SIZE
+                    self.screen.blit(self.disc_surfaces[animation.player], (c * SQ_SIZE, y))
+            color = GRAY if c == self.highlight_col else BLUE
+            self.screen.blit(self.column_surfaces[color], (c * SQ_SIZE, SQ_SIZE))
@@ -0,0 +1,29 @@
+import pytest
+from board import *
+
+def build(columns, mirrored=False):
+    board = Board()
+    for i, col in enumerate(columns):
+        col = mirror_column(col, mirrored)
+        board.place_piece(board.get_available_row(col), col, PLAYER_TURN if i % 2 == 0 else AI_TURN)
+    return board
+
+@pytest.mark.parametrize("columns", [[0, 1, 1, 6], [3, 2, 2, 5, 0], [6, 6, 6, 4]])
+def test_mirrored_positions_share_a_canonical_key(columns):
+    board, mirror = build(columns), build(columns, mirrored=True)
+    key, mirrored = board.canonical_key()
+    mirror_key, mirror_mirrored = mirror.canonical_key()
+    assert board.key() != mirror.key()
+    assert key == mirror_key
+    assert mirrored != mirror_mirrored
+    assert board.mirror_key() == mirror.key()
+
+def test_symmetric_position_is_not_mirrored():
+    board = build([3, 3, 3])
+    assert board.canonical_key() == (board.key(), False)
+
+def test_mirror_column_round_trips():
+    for mirrored in (True, False):
+        for col in range(COLS):
+            assert mirror_column(mirror_column(col, mirrored), mirrored) == col
+    assert [mirror_column(col) for col in range(COLS)] == list(reversed(range(COLS)))
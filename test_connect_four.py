@@ -0,0 +1,23 @@
+import pytest
+from board import *
+from connect_four import Connect4
+from engines import engine_factory
+from game_record import GameRecordReader, GameRecordWriter
+
+def test_opening_that_wins_ends_the_game_and_records_cleanly(tmp_path):
+    path = tmp_path / "games.c4r"
+    greedy = engine_factory("greedy")
+    with GameRecordWriter(path) as writer:
+        results, _ = Connect4(headless=True, recorder=writer).play_game(greedy, greedy, 1, [0, 1, 0, 1, 0, 1, 0, 1])
+    assert results["ai1_wins"] == 1
+    with GameRecordReader(path) as reader:
+        [record] = list(reader)
+    assert record.moves == [0, 1, 0, 1, 0, 1, 0]
+    assert record.timings == [0.0] * 7
+    assert record.result == PLAYER_TURN
+
+@pytest.mark.parametrize("opening", [[3] * (ROWS + 1), [COLS]])
+def test_opening_must_be_playable(opening):
+    greedy = engine_factory("greedy")
+    with pytest.raises(ValueError):
+        Connect4(headless=True, recorder=[]).play_game(greedy, greedy, 1, opening)
@@ -0,0 +1,100 @@
+import os
+import signal
+import socket
+import threading
+import time
+import pytest
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client
+import distributed
+from distributed import Coordinator, WorkUnitError, start_local_workers
+
+POSITION = [3, 3, 2]
+SLOW_UNIT = ("analyse", "minimax:depth=4", [[3, 3, 2], [3, 3, 2, 4], [0, 6, 3]])  # About a second per unit
+
+def collect(coordinator, timeout=120):
+    """Drain coordinator.results() on a thread so a lost unit fails the test instead of hanging it."""
+    results, errors = {}, []
+
+    def drain():
+        try:
+            results.update(coordinator.results())
+        except Exception as error:
+            errors.append(error)
+
+    thread = threading.Thread(target=drain, daemon=True)
+    thread.start()
+    thread.join(timeout)
+    assert not thread.is_alive(), "work units were lost"
+    if errors:
+        raise errors[0]
+    return results
+
+def wait_until_busy(coordinator, workers, timeout=30):
+    """Wait until every worker holds a unit."""
+    end = time.time() + timeout
+    while time.time() < end:
+        with coordinator.lock:
+            if len(coordinator.holders) >= workers:
+                return
+        time.sleep(0.05)
+    pytest.fail("workers never picked up work")
+
+def close_within(coordinator, timeout=10):
+    thread = threading.Thread(target=coordinator.close, daemon=True)
+    thread.start()
+    thread.join(timeout)
+    assert not thread.is_alive(), "close() hung"
+
+@pytest.mark.skipif(not hasattr(signal, "SIGSTOP"), reason="needs POSIX signals")
+def test_units_survive_killed_and_stopped_workers():
+    unit_timeout = 3
+    with Coordinator(unit_timeout=unit_timeout) as coordinator:
+        ids = [coordinator.submit(*SLOW_UNIT) for _ in range(3)]  # One unit per worker
+        workers = start_local_workers(coordinator.address, 3, coordinator.authkey)
+        try:
+            wait_until_busy(coordinator, 3)
+            with coordinator.lock:  # Nothing completes while the lock is held
+                assert sorted(coordinator.holders) == ids and not coordinator.queue and not coordinator.finished
+                os.kill(workers[0].pid, signal.SIGKILL)  # Lost mid-unit: re-queued on disconnect
+                os.kill(workers[1].pid, signal.SIGSTOP)  # Hung mid-unit: re-queued after unit_timeout
+                killed_at = time.time()
+            results = collect(coordinator)
+            # Only the third worker is left to finish all three units, and the stopped one's only after the timeout
+            assert time.time() - killed_at >= unit_timeout
+        finally:
+            os.kill(workers[1].pid, signal.SIGKILL)
+
+    assert sorted(results) == ids
+    assert len({tuple(moves) for moves in results.values()}) == 1
+
+def test_silent_client_does_not_block_workers_or_close(monkeypatch):
+    monkeypatch.setattr(distributed, "HANDSHAKE_TIMEOUT", 1)
+    coordinator = Coordinator()
+    with socket.create_connection(coordinator.address) as idle:  # Connects but never answers the challenge
+        time.sleep(0.2)
+        coordinator.submit("analyse", "minimax:depth=2", [POSITION])
+        start_local_workers(coordinator.address, 1, coordinator.authkey)
+        assert len(collect(coordinator, timeout=30)) == 1
+        close_within(coordinator)
+        idle.settimeout(10)
+        while idle.recv(1024):  # The challenge, then end of stream once the handshake times out
+            pass
+
+def test_worker_errors_reach_the_coordinator():
+    with Coordinator() as coordinator:
+        coordinator.submit("analyse", "no-such-engine", [POSITION])
+        start_local_workers(coordinator.address, 1, coordinator.authkey)
+        with pytest.raises(WorkUnitError, match="Unknown engine"):
+            collect(coordinator)
+
+def test_unknown_work_kind_is_rejected():
+    with Coordinator() as coordinator:
+        with pytest.raises(ValueError):
+            coordinator.submit("no-such-kind")
+
+def test_generated_keys_are_random_and_enforced():
+    with Coordinator() as first, Coordinator() as second:
+        assert first.authkey and first.authkey != second.authkey
+        with pytest.raises(AuthenticationError):
+            Client(first.address, authkey=second.authkey)
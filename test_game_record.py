@@ -0,0 +1,121 @@
+import pytest
+import game_record
+from board import *
+from game_record import (FILE_MAGIC, GameRecord, GameRecordReader, GameRecordWriter, MAX_TIMING_MS,
+                         decode_metadata, decode_record, encode_metadata, encode_record)
+
+def round_trip(record):
+    decoded, end = decode_record(encode_record(record))
+    assert end == len(encode_record(record))
+    return decoded
+
+@pytest.mark.parametrize("moves", [[], [3], [3, 3], [0, 6, 1, 5, 2], [6, 5, 4, 3, 2, 1]])
+def test_round_trip_odd_and_even_move_counts(moves):
+    timings = [0.25 * (i + 1) for i in range(len(moves))]
+    record = GameRecord(moves, 0, ["Minimax", "GreedyAI"], [{"depth": 3}, {}], timings)
+    decoded = round_trip(record)
+    assert decoded.moves == moves
+    assert decoded.result == 0
+    assert decoded.timings == pytest.approx(timings, abs=1e-3)
+
+def test_round_trip_results():
+    assert round_trip(GameRecord([3, 4, 3], None)).result is None
+    assert round_trip(GameRecord([3], PLAYER_TURN)).result == PLAYER_TURN
+    assert round_trip(GameRecord([3], AI_TURN)).result == AI_TURN
+
+def test_round_trip_metadata():
+    encoded = encode_metadata(7, ["Minimax", "GreedyAI"], [{"depth": 3}, {}])
+    assert decode_metadata(encoded) == (7, ["Minimax", "GreedyAI"], [{"depth": 3}, {}], len(encoded))
+
+def test_timings_saturate():
+    decoded = round_trip(GameRecord([3, 4], 0, timings=[1000.0, 0.0004]))
+    assert decoded.timings == [MAX_TIMING_MS / 1000, 0.0]
+
+def test_missing_timings_are_stored_as_zeros():
+    assert round_trip(GameRecord([3, 4, 5])).timings == [0.0, 0.0, 0.0]
+
+def test_timings_must_match_moves():
+    with pytest.raises(ValueError):
+        encode_record(GameRecord([3, 3, 3], timings=[0.1]))
+
+def test_moves_must_be_columns():
+    with pytest.raises(ValueError):
+        encode_record(GameRecord([3, COLS]))
+
+def test_file_holds_many_records(tmp_path):
+    path = tmp_path / "games.c4r"
+    records = [GameRecord([i % COLS] * (i % 5 + 1), i % 3, ["A", "B"], [{}, {"i": i}]) for i in range(20)]
+    with GameRecordWriter(path) as writer:
+        for record in records[:10]:
+            writer.append(record)
+    with GameRecordWriter(path) as writer:  # Reopening appends without a second file header
+        for record in records[10:]:
+            writer.append(record)
+
+    with GameRecordReader(path) as reader:
+        decoded = list(reader)
+    assert [r.moves for r in decoded] == [r.moves for r in records]
+    assert [r.params for r in decoded] == [r.params for r in records]
+
+def test_metadata_is_written_once_per_engine_pairing(tmp_path):
+    path = tmp_path / "games.c4r"
+    engines, params = ["MonteCarloTreeSearch", "IterativeDeepeningAI"], [{"iterations": 400}, {"max_depth": 6}]
+    records = [GameRecord([3, 3, 4, 4, 5], PLAYER_TURN, engines, params, [0.1] * 5) for _ in range(3)]
+    records.append(GameRecord([2, 2], None, engines[::-1], params[::-1]))
+    with GameRecordWriter(path) as writer:
+        for record in records:
+            writer.append(record)
+
+    metadata = [encode_metadata(0, engines, params), encode_metadata(1, engines[::-1], params[::-1])]
+    assert path.stat().st_size == (len(FILE_MAGIC) + sum(map(len, metadata))
+                                   + sum(len(encode_record(record)) for record in records))
+    with GameRecordReader(path) as reader:
+        decoded = list(reader)
+    assert [(r.engines, r.params) for r in decoded] == [(r.engines, r.params) for r in records]
+
+def test_metadata_indexes_are_rebound_when_full(tmp_path, monkeypatch):
+    monkeypatch.setattr(game_record, "MAX_METADATA_INDEX", 1)
+    path = tmp_path / "games.c4r"
+    records = [GameRecord([i], 0, [f"Engine{i % 3}"]) for i in range(COLS)]
+    with GameRecordWriter(path) as writer:
+        for record in records:
+            writer.append(record)
+    with GameRecordReader(path) as reader:
+        assert [r.engines for r in reader] == [r.engines for r in records]
+
+def test_record_before_its_metadata_is_rejected(tmp_path):
+    path = tmp_path / "games.c4r"
+    path.write_bytes(FILE_MAGIC + encode_record(GameRecord([3]), 5))
+    with GameRecordReader(path) as reader:
+        with pytest.raises(ValueError):
+            list(reader)
+
+def test_empty_file_reads_no_records(tmp_path):
+    path = tmp_path / "empty.c4r"
+    GameRecordWriter(path).close()
+    with GameRecordReader(path) as reader:
+        assert list(reader) == []
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "other.bin"
+    path.write_bytes(b"not a record file")
+    with pytest.raises(ValueError):
+        GameRecordReader(path)
+    with pytest.raises(ValueError):
+        GameRecordWriter(path)
+    assert path.read_bytes() == b"not a record file"
+
+def test_rejects_other_format_versions(tmp_path):
+    path = tmp_path / "old.c4r"
+    path.write_bytes(b"C4GR\x01\x00\x00\x00")
+    with pytest.raises(ValueError):
+        GameRecordReader(path)
+
+def test_positions_replay_moves():
+    record = GameRecord([3, 3, 4])
+    boards = list(record.positions())
+    assert len(boards) == 3
+    assert boards[-1].board[ROWS - 1][3] == PLAYER_TURN
+    assert boards[-1].board[ROWS - 2][3] == AI_TURN
+    assert boards[-1].board[ROWS - 1][4] == PLAYER_TURN
+    assert (record.position(2).board == boards[1].board).all()
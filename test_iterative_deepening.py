@@ -0,0 +1,48 @@
+import pytest
+from board import *
+from game_record import GameRecord
+from iterative_deepening import SEARCH_MODES, IterativeDeepeningAI
+
+# AI to move in each; none has a forced win or block, so the root searches every column
+POSITIONS = [[3], [3, 3, 2], [0, 6, 5, 1, 3], [3, 2, 3, 4, 2, 4, 1], [6, 6, 5, 3, 3, 2, 0]]
+DEPTH = 4
+
+def fixed_depth_value(ai, board, depth, is_maximizing):
+    """Plain minimax without pruning or a transposition table."""
+    if depth == 0 or board.is_game_over(board):
+        return ai.evaluate_board(board)
+    piece = AI_TURN if is_maximizing else PLAYER_TURN
+    values = []
+    for col in board.find_available_columns():
+        child = board.copy()
+        child.place_piece(child.get_available_row(col), col, piece)
+        values.append(fixed_depth_value(ai, child, depth - 1, not is_maximizing))
+    return max(values) if is_maximizing else min(values)
+
+def move_values(ai, board, depth):
+    values = {}
+    for col in board.find_available_columns():
+        child = board.copy()
+        child.place_piece(child.get_available_row(col), col, AI_TURN)
+        values[col] = fixed_depth_value(ai, child, depth - 1, False)
+    return values
+
+@pytest.mark.parametrize("columns", POSITIONS)
+def test_every_mode_matches_a_plain_fixed_depth_search(columns):
+    board = GameRecord(columns).position(len(columns))
+    reference = IterativeDeepeningAI(board)
+    assert reference.check_for_forced_move() is None
+    values = {depth: move_values(reference, board, depth) for depth in range(1, DEPTH + 1)}
+
+    for mode in SEARCH_MODES:
+        ai = IterativeDeepeningAI(board, max_depth=DEPTH, search_mode=mode)
+        guess = None
+        for depth in range(1, DEPTH + 1):  # As get_move deepens, sharing the table across iterations
+            move, score = ai.search_iteration(depth, guess)
+            assert score == max(values[depth].values()), (mode, depth)
+            assert values[depth][move] == score, (mode, depth)
+            guess = score
+
+def test_unknown_search_mode_is_rejected():
+    with pytest.raises(ValueError):
+        IterativeDeepeningAI(Board(), search_mode="no-such-mode")
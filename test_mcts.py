@@ -0,0 +1,16 @@
+import pytest
+from board import *
+from game_record import GameRecord
+from mcts import MonteCarloTreeSearch
+
+OPTIONS = [{}, {"rave_equivalence": 100, "prior_visits": 5}, {"widening": 0.5, "max_nodes": 50}]
+
+@pytest.mark.parametrize("options", OPTIONS)
+@pytest.mark.parametrize("columns, winning_move", [
+    ([0, 6, 0, 6, 0, 6], 0),  # PLAYER_TURN to move: MCTS plays first
+    ([0, 6, 0, 6, 0, 6, 1], 6),  # AI_TURN to move: MCTS plays second
+])
+def test_takes_the_win_for_the_side_to_move(columns, winning_move, options):
+    board = GameRecord(columns).position(len(columns))
+    mcts = MonteCarloTreeSearch(board, iterations=200, time_limit=60, **options)
+    assert mcts.get_move(board) == winning_move
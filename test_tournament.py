@@ -0,0 +1,58 @@
+import random
+import pytest
+from board import *
+from game_record import GameRecord
+from tournament import MatchStats, expected_score, random_opening, run_sprt, sprt_bounds
+
+def stats_from(pair_scores):
+    stats = MatchStats()
+    stats.pair_scores = list(pair_scores)
+    return stats
+
+def test_sprt_bounds():
+    lower, upper = sprt_bounds(0.05, 0.05)
+    assert lower == pytest.approx(-2.944, abs=1e-3)
+    assert upper == pytest.approx(2.944, abs=1e-3)
+
+def test_expected_score():
+    assert expected_score(0) == 0.5
+    assert expected_score(100) == pytest.approx(0.6401, abs=1e-4)
+    assert expected_score(-100) == pytest.approx(1 - expected_score(100))
+
+def test_llr_of_known_pair_scores():
+    # Four won pairs: variance of [1, 1, 1, 1] plus the pseudo-pairs 0 and 1 is 5/36, so
+    # LLR = 4 * (0.6401 - 0.5) * (2 - 0.5 - 0.6401) / (2 * 5/36)
+    assert stats_from([1.0] * 4).llr(0, 100) == pytest.approx(1.7345, abs=1e-3)
+    assert stats_from([0.0] * 4).llr(0, 100) < 0
+
+def test_llr_sign_follows_the_score_between_the_hypotheses():
+    assert stats_from([0.5] * 10).llr(-50, 50) == pytest.approx(0)
+    assert stats_from([0.75, 0.5] * 5).llr(-50, 50) > 0
+    assert stats_from([0.25, 0.5] * 5).llr(-50, 50) < 0
+    # The same mean over more pairs is stronger evidence
+    assert stats_from([0.75] * 20).llr(0, 50) > stats_from([0.75] * 5).llr(0, 50) > 0
+
+def test_elo_interval_contains_the_estimate_and_narrows():
+    for pair_scores in ([0.5] * 10, [0.75, 0.5, 1.0, 0.25] * 3):
+        stats = stats_from(pair_scores)
+        low, high = stats.elo_interval()
+        assert low < stats.elo() < high
+    low, high = stats_from([0.5] * 10).elo_interval()
+    assert low == pytest.approx(-high)
+    assert stats_from([0.5] * 40).elo_interval()[1] < high
+
+@pytest.mark.parametrize("plies", [0, 4, 8, 12])
+def test_random_opening_never_finishes_the_game(plies):
+    rng = random.Random(plies)
+    for _ in range(200):
+        opening = random_opening(plies, rng)
+        assert len(opening) == plies
+        board = GameRecord(opening).position(plies)
+        assert not board.is_game_over(board)
+
+def test_run_sprt_decides_a_lopsided_match():
+    stats, decision = run_sprt("minimax:depth=1", "greedy", elo0=0, elo1=200, max_pairs=30, workers=1, seed=1)
+    assert decision == "H1"
+    assert len(stats.pair_scores) < 30
+    stats, decision = run_sprt("greedy", "minimax:depth=1", elo0=0, elo1=200, max_pairs=30, workers=1, seed=1)
+    assert decision == "H0"
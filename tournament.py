@@ -0,0 +1,132 @@
+import math
+import multiprocessing
+import os
+import random
+from functools import partial
+from board import *
+from connect_four import Connect4
+from engines import engine_factory
+from game_record import GameRecordWriter
+
+def expected_score(elo):
+    """Expected score of a player rated `elo` points above its opponent."""
+    return 1 / (1 + 10 ** (-elo / 400))
+
+def elo_from_score(score):
+    score = min(max(score, 1e-3), 1 - 1e-3)  # Keep the estimate finite for whitewashes
+    return -400 * math.log10(1 / score - 1)
+
+def random_opening(plies, rng):
+    """A random sequence of `plies` columns, played before the engines take over. Openings that win are redrawn."""
+    while True:
+        board = Board()
+        opening = []
+        for i in range(plies):
+            player = PLAYER_TURN if i % 2 == 0 else AI_TURN
+            col = rng.choice(board.find_available_columns())
+            board.place_piece(board.get_available_row(col), col, player)
+            opening.append(col)
+            if board.has_won(player):
+                break
+        else:
+            return opening
+
+def play_pair(spec1, spec2, opening):
+    """Play the opening twice with colors swapped; return both GameRecords, engine1 first in the first game."""
+    records = []
+    game = Connect4(headless=True, recorder=records)
+    game.play_game(engine_factory(spec1), engine_factory(spec2), 1, opening)
+    game.play_game(engine_factory(spec2), engine_factory(spec1), 1, opening)
+    return records
+
+def game_score(record, engine1_first):
+    """Score of engine1 in a recorded game: 1 win, 0.5 draw, 0 loss."""
+    if record.result == 0:
+        return 0.5
+    return 1.0 if (record.result == PLAYER_TURN) == engine1_first else 0.0
+
+class MatchStats:
+    def __init__(self):
+        """Results of engine1 against engine2, kept per color-swapped pair."""
+        self.pair_scores = []  # engine1's mean score over each pair: 0, 0.25, 0.5, 0.75 or 1
+        self.wins = 0
+        self.draws = 0
+        self.losses = 0
+
+    def add_pair(self, records):
+        scores = [game_score(records[0], True), game_score(records[1], False)]
+        for score in scores:
+            if score == 1:
+                self.wins += 1
+            elif score == 0:
+                self.losses += 1
+            else:
+                self.draws += 1
+        self.pair_scores.append(sum(scores) / 2)
+
+    @property
+    def score(self):
+        return sum(self.pair_scores) / len(self.pair_scores)
+
+    def variance(self):
+        """Variance of the pair scores. Paired games share an opening, so pairs are the independent samples.
+
+        Two pseudo-pairs, one lost and one won, keep it above zero while every pair has ended the same way.
+        """
+        samples = self.pair_scores + [0.0, 1.0]
+        mean = sum(samples) / len(samples)
+        return sum((s - mean) ** 2 for s in samples) / len(samples)
+
+    def elo(self):
+        return elo_from_score(self.score)
+
+    def elo_interval(self, z=1.96):
+        """Elo confidence interval, 95% by default, from the normal approximation of the mean pair score."""
+        margin = z * math.sqrt(self.variance() / len(self.pair_scores))
+        return elo_from_score(self.score - margin), elo_from_score(self.score + margin)
+
+    def llr(self, elo0, elo1):
+        """Log-likelihood ratio of H1 (elo1) against H0 (elo0), normal approximation as in a GSPRT."""
+        s0, s1 = expected_score(elo0), expected_score(elo1)
+        return len(self.pair_scores) * (s1 - s0) * (2 * self.score - s0 - s1) / (2 * self.variance())
+
+def sprt_bounds(alpha, beta):
+    return math.log(beta / (1 - alpha)), math.log((1 - beta) / alpha)
+
+def run_sprt(spec1, spec2, elo0=0, elo1=10, alpha=0.05, beta=0.05, max_pairs=1000,
+             workers=None, opening_plies=4, record_path=None, seed=None):
+    """Test whether engine1 is elo1 rather than elo0 points stronger than engine2, stopping once decided.
+
+    Pairs are played on a process pool and scored as they finish. Returns the MatchStats and
+    "H1" (engine1 is stronger), "H0" (it is not), or None if max_pairs ran out first.
+    """
+    rng = random.Random(seed)
+    lower, upper = sprt_bounds(alpha, beta)
+    stats = MatchStats()
+    recorder = GameRecordWriter(record_path) if record_path else None
+    decision = None
+    openings = [random_opening(opening_plies, rng) for _ in range(max_pairs)]
+
+    pool = multiprocessing.Pool(workers or os.cpu_count())
+    try:
+        for records in pool.imap_unordered(partial(play_pair, spec1, spec2), openings):
+            if recorder:
+                for record in records:
+                    recorder.append(record)
+            stats.add_pair(records)
+            llr = stats.llr(elo0, elo1)
+            elo_low, elo_high = stats.elo_interval()
+            print(f"Pair {len(stats.pair_scores)}: +{stats.wins} ={stats.draws} -{stats.losses}, "
+                  f"Elo {stats.elo():.1f} [{elo_low:.1f}, {elo_high:.1f}], LLR {llr:.2f} [{lower:.2f}, {upper:.2f}]")
+            if llr >= upper:
+                decision = "H1"
+            elif llr <= lower:
+                decision = "H0"
+            if decision:
+                break
+    finally:
+        pool.terminate()  # Stops the pairs still running once the test is decided, not just the queued ones
+        pool.join()
+        if recorder:
+            recorder.close()
+    return stats, decision